@@ -35,6 +35,18 @@ class BaseBuilder(ABC):
         """Motorun ana üretim mantığı."""
         pass
 
+    def heartbeat(self):
+        """
+        Uzun süren üretim sırasında 'main.py'ye hâlâ çalışıldığını bildirir
+        (hammaddelerde 'heartbeat' verilmişse). İşin bayat sayılıp başka işçiye verilmesini önler.
+        """
+        callback = self.materials.get("heartbeat")
+        if callback:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Uyarı: [{self.job_name}] heartbeat gönderilemedi: {e}")
+
     def run(self):
         """
 Hata yönetimi için 'build'i kapsülleyen sarmalayıcı (Madde 7)
@@ -1,9 +1,12 @@
 # builders/pdf_builder.py
 import os
+import time
 from .base_builder import BaseBuilder
 from engine.video_processor import extract_frames_with_timestamps
 from engine.transcript_parser import parse_srt_file
 from engine.content_merger import match_frames_to_subs, merge_similar_segments
+from engine.token_budget import estimate_tokens, apply_token_budget, merge_split_parts, report_token_spend
+from engine.frame_classifier import route_groups, RoutingStats
 from PIL import Image
 
 # --- GEREKLİ REPORTLAB IMPORTLARI (EKSİKLER EKLENDİ) ---
@@ -90,17 +93,30 @@ class PDFBuilder(BaseBuilder):
 
                 # 2. AI Metni (Düzeltilmiş mock metni 'Vera' fontu ile yazılacak)
                 ai_text = step['ai_generated_text'].replace('\n', '<br/>')
-                p_text = Paragraph(ai_text, style_n)
+                pending = [Paragraph(ai_text, style_n)]
 
-                text_w, text_h = p_text.wrapOn(c, content_width, margin)
+                # Birleştirilmiş (bölünmüş grup) metinler bir sayfayı aşabilir: sığmayan kısmı sonraki sayfaya taşı
+                while pending:
+                    p_text = pending.pop(0)
+                    avail_h = current_y - margin
+                    text_w, text_h = p_text.wrapOn(c, content_width, avail_h)
 
-                if current_y - text_h < margin:
+                    if text_h <= avail_h:
+                        p_text.drawOn(c, margin, current_y - text_h)
+                        current_y -= text_h
+                        continue
+
+                    pieces = p_text.split(content_width, avail_h)
+                    if len(pieces) > 1:
+                        pending = pieces + pending
+                        continue
+
+                    # Hiçbir satır sığmıyor: yeni sayfaya geç
                     c.showPage()
                     current_y = h - margin
                     p_title.drawOn(c, margin, current_y - 30)
                     current_y -= 60
-
-                p_text.drawOn(c, margin, current_y - text_h)
+                    pending.insert(0, p_text)
 
                 c.showPage()
 
@@ -136,23 +152,61 @@ class PDFBuilder(BaseBuilder):
             self.config.IMAGE_SIMILARITY_THRESHOLD
         )
 
+        # 3. Token bütçesini uygula ve tahmini harcamayı AI çağrısından önce raporla
+        grouped = apply_token_budget(
+            grouped,
+            self.config.MAX_TOKENS_PER_GROUP,
+            self.config.MAX_TOKENS_PER_JOB,
+            prompt_overhead_tokens=estimate_tokens(self._generate_pdf_prompt(""), self.config.CHARS_PER_TOKEN),
+            image_tokens=self.config.IMAGE_TOKEN_ESTIMATE,
+            chars_per_token=self.config.CHARS_PER_TOKEN
+        )
+
+        # Yeni görsel bilgi taşımayan kareleri (boş, sadece kamera, tekrar) sadece metin çağrısına yönlendir
+        if self.config.FRAME_ROUTING_ENABLED:
+            route_groups(
+                self.job_name,
+                grouped,
+                self.config.BLANK_STDDEV_THRESHOLD,
+                self.config.BLANK_EDGE_DENSITY_THRESHOLD,
+                self.config.WEBCAM_ENTROPY_THRESHOLD,
+                self.config.WEBCAM_EDGE_DENSITY_THRESHOLD,
+                self.config.DUPLICATE_PHASH_THRESHOLD
+            )
+            for group in grouped:
+                if not group['send_image']:
+                    group['estimated_tokens'] -= self.config.IMAGE_TOKEN_ESTIMATE
+        report_token_spend(self.job_name, grouped)
+
         final_instructions = []
+        routing_stats = RoutingStats()
         print(f"[{self.job_name}] {len(grouped)} grup için AI metni üretiyor...")
 
         for group in grouped:
+            self.heartbeat()  # Her AI çağrısından önce işin canlı olduğunu bildir
             prompt = self._generate_pdf_prompt(group['combined_transcript'])
+            send_image = group.get('send_image', True)
 
             # 4. Standart AI motorunu (Gemini veya Mock) çağır
+            call_start = time.perf_counter()
             ai_text = self.ai_provider.generate_content(
                 prompt,
-                Image.open(group['representative_png'])
+                Image.open(group['representative_png']) if send_image else None
             )
+            routing_stats.record(group['representative_png'], send_image, time.perf_counter() - call_start)
 
             final_instructions.append({
                 "representative_png": group['representative_png'],
+                "group_index": group.get('group_index'),
                 "ai_generated_text": ai_text
             })
 
+        if self.config.FRAME_ROUTING_ENABLED:
+            routing_stats.report(self.job_name)
+
+        # Token bütçesi için bölünmüş grupları PDF'te tek adım olarak göster
+        final_instructions = merge_split_parts(final_instructions)
+
         # 5. Son ürünü inşa et
         final_pdf_path = os.path.join(self.builder_output_dir, "Anlatim_Kitabi.pdf")
         self._create_pdf_file(final_instructions, final_pdf_path)
\ No newline at end of file
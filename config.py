@@ -12,11 +12,25 @@ API_ANAHTARI = os.environ.get("GOOGLE_API_KEY")
 # .env'de belirtilmemişse, güvenli mod olan "MOCK"u varsay
 AI_PROVIDER_TYPE = os.environ.get("AI_PROVIDER_TYPE", "MOCK")
 AI_MODEL_NAME = "gemini-pro-vision" # (Gemini kullanılıyorsa)
+AI_TEXT_MODEL_NAME = "gemini-pro"   # Görsel gönderilmeyen (sadece metin) çağrılar için daha hızlı model
+# Yerel stub sunucusu için (örn: http://127.0.0.1:8765). Boşsa gerçek Google API'si kullanılır.
+GEMINI_API_ENDPOINT = os.environ.get("GEMINI_API_ENDPOINT")
+# "RECORD" / "REPLAY" sağlayıcıları için kaset dosyası ve oynatma hızı
+# (1 = kaydedilen gecikmelerle, 2 = iki kat hızlı, 0 = hiç beklemeden)
+AI_CASSETTE_PATH = os.environ.get("AI_CASSETTE_PATH", os.path.join("cassettes", "gemini.jsonl"))
+AI_REPLAY_SPEED = float(os.environ.get("AI_REPLAY_SPEED", 1.0))
 
 # 4. İş Bazlı Girdi/Çıktı Klasörleri (Madde 2)
 INPUT_DIR = "input"
 OUTPUT_DIR = "output"
 
+# İş durum veritabanı (SQLite, WAL modu). status.json yalnızca uyumluluk için dışa aktarılır.
+JOB_DB_PATH = os.environ.get("JOB_DB_PATH", os.path.join(OUTPUT_DIR, "jobs.db"))
+EXPORT_STATUS_JSON = os.environ.get("EXPORT_STATUS_JSON", "1") == "1"
+# 'İŞLENİYOR' bir işin sahibi aynı makinede ve süreci ölmüşse iş hemen yeniden alınır.
+# Başka makinedeki sahipler için: bu süre (sn) boyunca heartbeat gelmeyen iş çökmüş sayılır.
+JOB_STALE_AFTER_SEC = int(os.environ.get("JOB_STALE_AFTER_SEC", 6 * 3600))
+
 # 5. Çalıştırılacak Motorlar (Fabrika Modeli)
 BUILDERS_TO_RUN = [
     "PDF",
@@ -27,4 +41,27 @@ BUILDERS_TO_RUN = [
 # 6. Motor Parametreleri (PDFBuilder bunları okuyacak)
 CAPTURE_INTERVAL_SEC = 5
 MIN_TEXT_LENGTH_FOR_GROUPING = 25
-IMAGE_SIMILARITY_THRESHOLD = 5
\ No newline at end of file
+IMAGE_SIMILARITY_THRESHOLD = 5
+
+# 7. Token Bütçesi (Aşırı büyük istemleri önlemek için)
+MAX_TOKENS_PER_GROUP = int(os.environ.get("MAX_TOKENS_PER_GROUP", 4000))  # Tek bir AI çağrısı için üst sınır
+MAX_TOKENS_PER_JOB = int(os.environ.get("MAX_TOKENS_PER_JOB", 200000))    # Bir işin toplam üst sınırı
+# Kaba token tahmini için karakter/token oranı (Türkçe metin İngilizceden daha çok token'a bölünür)
+CHARS_PER_TOKEN = float(os.environ.get("CHARS_PER_TOKEN", 3.0))
+IMAGE_TOKEN_ESTIMATE = 258  # Görsel başına tahmini token maliyeti
+
+# 8. Görsel Yönlendirme (Yeni bilgi taşımayan kareler AI'a görselsiz gönderilir)
+# ERTELENMİŞ ÖZELLİK BAYRAĞI: 'input/' altındaki gerçek ders videolarıyla kalibre edilene kadar kapalı.
+# Açmadan önce çıkarılmış kareler üzerinde ölçütleri kontrol edin:
+#   python -m engine.frame_classifier output/<iş>/pdf/screenshots
+# Mevcut eşikler, mp4v kodlama/çözme sonrası ölçülen sentetik ve örnek karelere göredir:
+#   metin slaytı / koyu kod editörü / kutu-ok diyagramı / terminal: entropi 0.1-2.5 bit,
+#     std 18-57, kenar 0.0024-0.10 (seyrek başlık slaytı 0.0024)
+#   gerçek fotoğraf (kamera yerine): entropi 7.35 bit, std 53.8, kenar 0.022
+#   siyah / gürültülü gri boş kare: entropi 0-2.2 bit, std 0-1.1, kenar 0.0
+FRAME_ROUTING_ENABLED = os.environ.get("FRAME_ROUTING_ENABLED", "0") == "1"
+BLANK_STDDEV_THRESHOLD = 6.0             # Gri ton std bunun altındaysa kare tek düzedir (boş: <=1.1, slayt: >=18)...
+BLANK_EDGE_DENSITY_THRESHOLD = 0.001     # ...ve kenar yoğunluğu da bunun altındaysa boş sayılır (boş: 0, seyrek slayt: 0.0024)
+WEBCAM_ENTROPY_THRESHOLD = 5.0           # Entropisi (bit) bunun üstündeki kareler doğal görüntüdür (slayt: <=2.5, fotoğraf: 7.35)...
+WEBCAM_EDGE_DENSITY_THRESHOLD = 0.03     # ...ve kenar yoğunluğu bunun altındaysa sadece kamera sayılır (fotoğraf: 0.022)
+DUPLICATE_PHASH_THRESHOLD = IMAGE_SIMILARITY_THRESHOLD  # Gönderilmiş bir kareye bu pHash mesafesinde olanlar tekrar sayılır
@@ -7,16 +7,31 @@ from .ai_base import BaseAIProvider
 class GeminiProvider(BaseAIProvider):
 
     def __init__(self, config):
-        super().__init__(config)
+        # get_name() başlangıç mesajında uç noktayı kullandığı için super() çağrısından önce atanır
         self.api_key = config.API_ANAHTARI
         self.model_name = config.AI_MODEL_NAME
+        self.api_endpoint = config.GEMINI_API_ENDPOINT
+        super().__init__(config)
+        self.text_model_name = config.AI_TEXT_MODEL_NAME
         try:
-            genai.configure(api_key=self.api_key)
+            if self.api_endpoint:
+                # Yerel stub sunucusu (engine/gemini_stub_server.py) veya başka bir uç nokta
+                genai.configure(
+                    api_key=self.api_key or "stub",
+                    transport="rest",
+                    client_options={"api_endpoint": self.api_endpoint}
+                )
+            else:
+                genai.configure(api_key=self.api_key)
             self.model = genai.GenerativeModel(self.model_name)
+            # Görselsiz çağrılar için ayrı (metin) model; vision modeli görselsiz isteği kabul etmeyebilir
+            self.text_model = genai.GenerativeModel(self.text_model_name)
         except Exception as e:
             raise ValueError(f"Gemini modeli başlatılamadı. API anahtarınızı kontrol edin. Hata: {e}")
 
     def get_name(self) -> str:
+        if self.api_endpoint:
+            return f"Google Gemini ({self.api_endpoint})"
         return "Google Gemini"
 
     def generate_content(self, prompt: str, image: Image.Image = None) -> str:
@@ -24,7 +39,7 @@ class GeminiProvider(BaseAIProvider):
             if image:
                 response = self.model.generate_content([prompt, image])
             else:
-                response = self.model.generate_content(prompt)
+                response = self.text_model.generate_content(prompt)
             return response.text
         except Exception as e:
             print(f"Hata: Gemini API çağrısı başarısız oldu. Hata: {e}")
@@ -0,0 +1,111 @@
+# engine/ai_replay.py
+import hashlib
+import json
+import os
+import threading
+import time
+from PIL import Image
+from .ai_base import BaseAIProvider
+
+
+# --- Yardımcı Fonksiyon (Dışarıdan erişilmez) ---
+def _request_key(prompt: str, image: Image.Image = None) -> str:
+    """İstem ve görselden deterministik bir kayıt anahtarı üretir."""
+    h = hashlib.sha256(prompt.encode("utf-8"))
+    if image is not None:
+        h.update(f"{image.mode}:{image.size}".encode("utf-8"))
+        h.update(image.tobytes())
+    return h.hexdigest()
+
+
+class RecordingProvider(BaseAIProvider):
+    """
+    Gerçek bir sağlayıcıyı (varsayılan: Gemini) sarar ve her istek/yanıt çiftini
+    ölçülen gecikmesiyle birlikte kaset dosyasına (JSONL) kaydeder.
+    """
+
+    def __init__(self, config, inner_provider: BaseAIProvider = None):
+        self.cassette_path = config.AI_CASSETTE_PATH
+        self._lock = threading.Lock()
+        if inner_provider is None:
+            from .ai_gemini import GeminiProvider  # Sadece kayıt modunda gerekli
+            inner_provider = GeminiProvider(config)
+        self.inner = inner_provider
+        super().__init__(config)
+
+        cassette_dir = os.path.dirname(self.cassette_path)
+        if cassette_dir:
+            os.makedirs(cassette_dir, exist_ok=True)
+
+    def get_name(self) -> str:
+        return f"Kayıt Sağlayıcısı ({self.inner.get_name()} -> {self.cassette_path})"
+
+    def generate_content(self, prompt: str, image: Image.Image = None) -> str:
+        start = time.perf_counter()
+        response = self.inner.generate_content(prompt, image)
+        latency = time.perf_counter() - start
+
+        entry = {
+            "key": _request_key(prompt, image),
+            "prompt_chars": len(prompt),
+            "image_size": list(image.size) if image is not None else None,
+            "latency_sec": round(latency, 4),
+            "response": response,
+        }
+        try:
+            with self._lock, open(self.cassette_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"Uyarı: Kaset dosyasına yazılamadı ({self.cassette_path}). Hata: {e}")
+
+        return response
+
+
+class ReplayProvider(BaseAIProvider):
+    """
+    Kaydedilmiş istek/yanıt çiftlerini ağ erişimi olmadan deterministik olarak oynatır.
+    Kaydedilen gecikme AI_REPLAY_SPEED değerine bölünerek beklenir
+    (1 = gerçek hızda, 2 = iki kat hızlı, 0 = beklemeden).
+    """
+
+    def __init__(self, config):
+        self.cassette_path = config.AI_CASSETTE_PATH
+        self.speed = config.AI_REPLAY_SPEED
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> kayıt listesi (aynı istem birden çok kez kaydedilmiş olabilir)
+        self._cursors = {}
+
+        if not os.path.exists(self.cassette_path):
+            raise ValueError(f"Oynatma için kaset dosyası bulunamadı: {self.cassette_path}")
+
+        with open(self.cassette_path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Uyarı: Kaset satırı {line_no} bozuk. Atlanıyor.")
+                    continue
+                self._entries.setdefault(entry["key"], []).append(entry)
+
+        super().__init__(config)
+
+    def get_name(self) -> str:
+        return f"Oynatma Sağlayıcısı ({self.cassette_path}, {sum(map(len, self._entries.values()))} kayıt)"
+
+    def generate_content(self, prompt: str, image: Image.Image = None) -> str:
+        key = _request_key(prompt, image)
+        with self._lock:
+            recorded = self._entries.get(key)
+            if not recorded:
+                print(f"Hata: Kasette eşleşen kayıt yok (anahtar: {key[:12]}...).")
+                return "[Oynatma Hatası: Kasette eşleşen kayıt bulunamadı]"
+            # Aynı istem tekrarlanırsa kayıtlar sırayla, sonra başa dönerek oynatılır
+            cursor = self._cursors.get(key, 0)
+            entry = recorded[cursor % len(recorded)]
+            self._cursors[key] = cursor + 1
+
+        if self.speed > 0:
+            time.sleep(entry["latency_sec"] / self.speed)
+        return entry["response"]
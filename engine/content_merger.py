@@ -57,7 +57,8 @@ def merge_similar_segments(
     Bu, PDF veya Blog motorları için kullanışlıdır.
 
     Returns:
-        List[Dict[str, Any]]: {'representative_png', 'combined_transcript'} listesi.
+        List[Dict[str, Any]]: {'representative_png', 'representative_phash', 'combined_transcript'} listesi.
+                              ('representative_phash' hesaplanamadıysa None olabilir.)
     """
     print("  [İçerik Birleştirici] Benzer/kısa segmentler gruplanıyor...")
     if not matched_data:
@@ -98,6 +99,7 @@ def merge_similar_segments(
             # Mevcut grubu kaydet
             grouped_steps.append({
                 "representative_png": current_group_png,
+                "representative_phash": last_valid_hash,
                 "combined_transcript": " ".join(filter(None, current_group_transcript))
             })
 
@@ -109,6 +111,7 @@ def merge_similar_segments(
     # Döngüden sonra kalan son grubu da ekle
     grouped_steps.append({
         "representative_png": current_group_png,
+        "representative_phash": last_valid_hash,
         "combined_transcript": " ".join(filter(None, current_group_transcript))
     })
 
@@ -0,0 +1,237 @@
+# engine/frame_classifier.py
+import math
+import os
+import sys
+import threading
+from typing import List, Dict, Any, Tuple
+
+import cv2
+from PIL import Image
+
+# Kare sınıfları: Sadece 'GORSEL' sınıfındaki kareler AI'a görsel olarak gönderilir
+FRAME_BLANK = "BOS"           # Boş/tek renk kare (geçiş, siyah ekran vb.)
+FRAME_WEBCAM = "KAMERA"       # Sadece konuşmacı kamerası (metin/diyagram yok)
+FRAME_DUPLICATE = "TEKRAR"    # Daha önce görsel olarak gönderilmiş bir kareyle neredeyse aynı
+FRAME_VISUAL = "GORSEL"       # Yeni görsel içerik taşıyor
+
+
+# --- Yardımcı Fonksiyonlar (Dışarıdan erişilmez) ---
+def _gray_stats(image_path: str) -> Tuple[float, float]:
+    """
+    Gri tonlamalı görüntünün (Shannon entropisi [bit], standart sapması [0-255]) değerlerini hesaplar.
+    Entropi kaç farklı ton kullanıldığını ölçer (doğal görüntülerde yüksek, slaytlarda düşüktür);
+    standart sapma ise karenin tek düze olup olmadığını gösterir.
+    """
+    with Image.open(image_path) as img:
+        histogram = img.convert("L").histogram()
+    total = sum(histogram)
+    if total == 0:
+        return 0.0, 0.0
+    entropy = max(0.0, -sum((c / total) * math.log2(c / total) for c in histogram if c))  # Tek ton: -0.0 yerine 0.0
+    mean = sum(i * c for i, c in enumerate(histogram)) / total
+    variance = sum(c * (i - mean) ** 2 for i, c in enumerate(histogram)) / total
+    return entropy, math.sqrt(variance)
+
+
+def _edge_density(image_path: str, max_side: int = 640) -> float:
+    """Canny kenarlarına düşen piksel oranını (0-1) hesaplar. Metin ve diyagramlar yüksek değer verir."""
+    gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return 0.0
+    h, w = gray.shape[:2]
+    scale = max_side / max(h, w)
+    if scale < 1:
+        gray = cv2.resize(gray, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+    edges = cv2.Canny(gray, 100, 200)
+    return float(cv2.countNonZero(edges)) / edges.size
+
+
+def frame_metrics(image_path: str) -> Dict[str, float]:
+    """Bir karenin sınıflandırmada kullanılan ölçütlerini döndürür (eşik kalibrasyonu için de kullanılır)."""
+    entropy, stddev = _gray_stats(image_path)
+    return {"entropy": entropy, "stddev": stddev, "edge_density": _edge_density(image_path)}
+
+
+# --- Ana Fonksiyon 1: Sınıflandırma ---
+def classify_frame(
+        image_path: str,
+        phash,
+        sent_hashes: list,
+        blank_stddev_threshold: float,
+        blank_edge_density_threshold: float,
+        webcam_entropy_threshold: float,
+        webcam_edge_density_threshold: float,
+        duplicate_phash_threshold: int
+) -> Tuple[str, Dict[str, float]]:
+    """
+    Bir kareyi ucuz görüntü ölçütleriyle sınıflandırır.
+
+    - BOS: Tek düze kare (düşük standart sapma) VE neredeyse hiç kenar yok.
+    - KAMERA: Doğal görüntü (yüksek entropi) VE düşük kenar yoğunluğu.
+      (Az içerikli slaytlar düşük entropili olduğu için bu sınıfa düşmez.)
+    - TEKRAR: Daha önce görsel olarak gönderilmiş bir kareye pHash mesafesi eşik altında.
+
+    Args:
+        phash: 'content_merger' tarafından hesaplanan pHash (None olabilir).
+        sent_hashes: Daha önce AI'a görsel olarak gönderilmiş karelerin pHash listesi.
+
+    Returns:
+        Tuple[str, Dict[str, float]]: (sınıf, {'entropy', 'stddev', 'edge_density', 'phash_distance'})
+    """
+    metrics = {"entropy": 0.0, "stddev": 0.0, "edge_density": 0.0, "phash_distance": -1}
+
+    # 1. Daha önce gönderilen bir kareyle neredeyse aynı mı? (en ucuz kontrol önce)
+    if phash is not None and sent_hashes:
+        distance = min(phash - h for h in sent_hashes)
+        metrics["phash_distance"] = distance
+        if distance <= duplicate_phash_threshold:
+            return FRAME_DUPLICATE, metrics
+
+    try:
+        metrics.update(frame_metrics(image_path))
+    except Exception as e:
+        # Ölçülemeyen kareyi güvenli tarafta kal ve görsel olarak gönder
+        print(f"Uyarı: Kare sınıflandırılamadı ({image_path}). Görsel gönderilecek. Hata: {e}")
+        return FRAME_VISUAL, metrics
+
+    # 2. Boş kare mi? (tek düze VE kenarsız; sıkıştırma gürültüsü entropiyi yükseltse de kenar üretmez)
+    if metrics["stddev"] < blank_stddev_threshold and metrics["edge_density"] < blank_edge_density_threshold:
+        return FRAME_BLANK, metrics
+
+    # 3. Sadece kamera mı? (çok tonlu doğal görüntü ama metin/diyagram kenarı yok)
+    if metrics["entropy"] >= webcam_entropy_threshold and metrics["edge_density"] < webcam_edge_density_threshold:
+        return FRAME_WEBCAM, metrics
+
+    return FRAME_VISUAL, metrics
+
+
+# --- Ana Fonksiyon 2: Yönlendirme ---
+def route_groups(
+        job_name: str,
+        grouped_steps: List[Dict[str, Any]],
+        blank_stddev_threshold: float,
+        blank_edge_density_threshold: float,
+        webcam_entropy_threshold: float,
+        webcam_edge_density_threshold: float,
+        duplicate_phash_threshold: int
+) -> List[Dict[str, Any]]:
+    """
+    Her grubun temsilci karesini sınıflandırır ve AI çağrısının görsel içerip içermeyeceğine karar verir.
+
+    Returns:
+        List[Dict[str, Any]]: Aynı liste; her gruba 'frame_class' ve 'send_image' eklenir.
+    """
+    print(f"[{job_name}] Kareler sınıflandırılıyor (görsel / sadece metin yönlendirmesi)...")
+    sent_hashes = []
+    counts = {}
+
+    for i, group in enumerate(grouped_steps):
+        phash = group.get('representative_phash')
+        frame_class, metrics = classify_frame(
+            group['representative_png'],
+            phash,
+            sent_hashes,
+            blank_stddev_threshold,
+            blank_edge_density_threshold,
+            webcam_entropy_threshold,
+            webcam_edge_density_threshold,
+            duplicate_phash_threshold
+        )
+        group['frame_class'] = frame_class
+        group['send_image'] = frame_class == FRAME_VISUAL
+        if group['send_image'] and phash is not None:
+            sent_hashes.append(phash)
+
+        counts[frame_class] = counts.get(frame_class, 0) + 1
+        route = "GÖRSEL+METİN" if group['send_image'] else "SADECE METİN"
+        print(
+            f"  [Kare Sınıflandırıcı] Grup {i + 1}: {frame_class} -> {route} "
+            f"(entropi={metrics['entropy']:.2f}, std={metrics['stddev']:.1f}, "
+            f"kenar={metrics['edge_density']:.4f}, pHash mesafesi={metrics['phash_distance']})"
+        )
+
+    print(f"[{job_name}] Yönlendirme tamamlandı: {counts}")
+    return grouped_steps
+
+
+class RoutingStats:
+    """
+    Yönlendirme kararlarının kazancını ölçer: atlanan görsel baytları ve
+    görselli/görselsiz çağrıların gecikme farkı. (İş parçacığı güvenli)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.image_latencies = []
+        self.text_latencies = []
+        self.bytes_sent = 0
+        self.bytes_saved = 0
+
+    def record(self, image_path: str, sent_image: bool, latency_sec: float):
+        try:
+            size = os.path.getsize(image_path)
+        except OSError:
+            size = 0
+        with self._lock:
+            if sent_image:
+                self.image_latencies.append(latency_sec)
+                self.bytes_sent += size
+            else:
+                self.text_latencies.append(latency_sec)
+                self.bytes_saved += size
+
+    def report(self, job_name: str) -> Dict[str, Any]:
+        """Kazanç özetini yazdırır ve döndürür."""
+        with self._lock:
+            avg_image = sum(self.image_latencies) / len(self.image_latencies) if self.image_latencies else None
+            avg_text = sum(self.text_latencies) / len(self.text_latencies) if self.text_latencies else None
+            summary = {
+                "image_calls": len(self.image_latencies),
+                "text_calls": len(self.text_latencies),
+                "avg_image_latency_sec": round(avg_image, 3) if avg_image is not None else None,
+                "avg_text_latency_sec": round(avg_text, 3) if avg_text is not None else None,
+                "bytes_sent": self.bytes_sent,
+                "bytes_saved": self.bytes_saved,
+                # İki yol da ölçüldüyse: sadece-metin çağrılarının görselli olsaydı harcayacağı ek süre
+                "latency_saved_sec": (
+                    round((avg_image - avg_text) * len(self.text_latencies), 3)
+                    if avg_image is not None and avg_text is not None else None
+                ),
+            }
+
+        print(
+            f"[{job_name}] Görsel yönlendirme özeti: {summary['image_calls']} görselli, "
+            f"{summary['text_calls']} sadece metin çağrı. "
+            f"Atlanan görsel: {summary['bytes_saved'] / 1024:.1f} KB, "
+            f"tahmini kazanılan süre: {summary['latency_saved_sec']} sn."
+        )
+        return summary
+
+
+def main():
+    """
+    Eşik kalibrasyonu: çıkarılmış karelerin ölçütlerini yazdırır.
+        python -m engine.frame_classifier output/<iş>/pdf/screenshots
+    """
+    import config
+
+    folder = sys.argv[1] if len(sys.argv) > 1 else config.OUTPUT_DIR
+    print("dosya\tentropi\tstd\tkenar\tsinif")
+    for root, _, files in os.walk(folder):
+        for name in sorted(files):
+            if not name.lower().endswith(".png"):
+                continue
+            path = os.path.join(root, name)
+            frame_class, m = classify_frame(
+                path, None, [],
+                config.BLANK_STDDEV_THRESHOLD,
+                config.BLANK_EDGE_DENSITY_THRESHOLD,
+                config.WEBCAM_ENTROPY_THRESHOLD,
+                config.WEBCAM_EDGE_DENSITY_THRESHOLD,
+                config.DUPLICATE_PHASH_THRESHOLD
+            )
+            print(f"{path}\t{m['entropy']:.2f}\t{m['stddev']:.1f}\t{m['edge_density']:.4f}\t{frame_class}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+# engine/gemini_stub_server.py
+"""
+Gemini API'sini taklit eden yerel HTTP sunucusu (ağ erişimi olmadan yük testi için).
+
+GeminiProvider, config.GEMINI_API_ENDPOINT ile bu sunucuya yönlendirilebilir:
+    python -m engine.gemini_stub_server --port 8765 --latency lognormal --mean 1.5 --rate-limit 0.05 --failure 0.02
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8765 AI_PROVIDER_TYPE=GEMINI python main.py
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# --- Yardımcı Fonksiyon: Gecikme Dağılımları ---
+def sample_latency(rng: random.Random, distribution: str, mean: float, spread: float) -> float:
+    """Seçilen dağılıma göre saniye cinsinden bir gecikme değeri üretir."""
+    if distribution == "fixed":
+        return mean
+    if distribution == "uniform":
+        return rng.uniform(max(0.0, mean - spread), mean + spread)
+    if distribution == "normal":
+        return max(0.0, rng.gauss(mean, spread))
+    if distribution == "lognormal":
+        # Ortalaması 'mean' olacak şekilde parametrelenmiş log-normal (uzun kuyruklu gecikmeler)
+        if mean <= 0:
+            return 0.0
+        sigma = spread
+        mu = math.log(mean) - sigma ** 2 / 2
+        return rng.lognormvariate(mu, sigma)
+    raise ValueError(f"Bilinmeyen gecikme dağılımı: '{distribution}'")
+
+
+class StubSettings:
+    """Sunucu davranışını belirleyen ayarlar (istekler arasında paylaşılır)."""
+
+    def __init__(self, latency="fixed", mean=1.0, spread=0.5, rate_limit_rate=0.0,
+                 failure_rate=0.0, max_concurrent=0, response_text=None, seed=None):
+        self.latency = latency
+        self.mean = mean
+        self.spread = spread
+        self.rate_limit_rate = rate_limit_rate
+        self.failure_rate = failure_rate
+        self.max_concurrent = max_concurrent  # 0 = sınırsız; aşılırsa 429 döner
+        self.response_text = response_text
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "failed": 0, "request_bytes": 0}
+
+
+class _GeminiStubHandler(BaseHTTPRequestHandler):
+    settings: StubSettings = None
+
+    def log_message(self, format, *args):
+        pass  # Yük testinde her isteği konsola basma
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, api_status: str, message: str):
+        self._send_json(status, {"error": {"code": status, "message": message, "status": api_status}})
+
+    def do_POST(self):
+        s = self.settings
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+
+        if ":generateContent" not in self.path:
+            self._send_error(404, "NOT_FOUND", f"Desteklenmeyen yol: {self.path}")
+            return
+
+        with s.lock:
+            s.stats["requests"] += 1
+            s.stats["request_bytes"] += len(raw)
+            s.in_flight += 1
+            over_limit = s.max_concurrent and s.in_flight > s.max_concurrent
+            roll = s.rng.random()
+            delay = sample_latency(s.rng, s.latency, s.mean, s.spread)
+
+        try:
+            # 1. Eşzamanlılık veya rastgele kota aşımı -> 429
+            if over_limit or roll < s.rate_limit_rate:
+                with s.lock:
+                    s.stats["rate_limited"] += 1
+                self._send_error(429, "RESOURCE_EXHAUSTED", "Stub: Kota aşıldı (rate limit).")
+                return
+
+            time.sleep(delay)
+
+            # 2. Rastgele sunucu hatası -> 500
+            if roll < s.rate_limit_rate + s.failure_rate:
+                with s.lock:
+                    s.stats["failed"] += 1
+                self._send_error(500, "INTERNAL", "Stub: Sunucu hatası.")
+                return
+
+            try:
+                request_data = json.loads(raw or b"{}")
+            except json.JSONDecodeError:
+                self._send_error(400, "INVALID_ARGUMENT", "Stub: Geçersiz JSON.")
+                return
+
+            parts = [p for c in request_data.get("contents", []) for p in c.get("parts", [])]
+            image_count = sum(1 for p in parts if "inlineData" in p or "inline_data" in p)
+            text = s.response_text or (
+                "[STUB AI CEVABI]\n"
+                f"1. İstek {len(raw)} bayt, {image_count} görsel içeriyordu.\n"
+                f"2. Yapay gecikme: {delay:.3f} sn."
+            )
+
+            with s.lock:
+                s.stats["ok"] += 1
+            self._send_json(200, {
+                "candidates": [{
+                    "content": {"parts": [{"text": text}], "role": "model"},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }],
+                "usageMetadata": {
+                    "promptTokenCount": len(raw) // 4,
+                    "candidatesTokenCount": len(text) // 4,
+                    "totalTokenCount": (len(raw) + len(text)) // 4,
+                },
+            })
+        finally:
+            with s.lock:
+                s.in_flight -= 1
+
+
+def create_server(host: str = "127.0.0.1", port: int = 8765, settings: StubSettings = None) -> ThreadingHTTPServer:
+    """Ayarları verilen stub sunucusunu oluşturur (serve_forever çağrısı çağırana bırakılır)."""
+    handler = type("GeminiStubHandler", (_GeminiStubHandler,), {"settings": settings or StubSettings()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel Gemini stub sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="lognormal", choices=["fixed", "uniform", "normal", "lognormal"])
+    parser.add_argument("--mean", type=float, default=1.0, help="Ortalama gecikme (sn)")
+    parser.add_argument("--spread", type=float, default=0.5, help="Yayılım (uniform: ±sn, normal: std, lognormal: sigma)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="429 dönme olasılığı (0-1)")
+    parser.add_argument("--failure", type=float, default=0.0, help="500 dönme olasılığı (0-1)")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="Eşzamanlı istek sınırı (0 = sınırsız)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    settings = StubSettings(args.latency, args.mean, args.spread, args.rate_limit,
+                            args.failure, args.max_concurrent, seed=args.seed)
+    server = create_server(args.host, args.port, settings)
+    print(f"[Gemini Stub] http://{args.host}:{args.port} dinleniyor (Ctrl+C ile durdur)...")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"[Gemini Stub] Durduruldu. İstatistikler: {settings.stats}")
+
+
+if __name__ == "__main__":
+    main()
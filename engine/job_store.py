@@ -0,0 +1,348 @@
+# engine/job_store.py
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_name      TEXT PRIMARY KEY,
+    genel_durum   TEXT NOT NULL,
+    created_at    TEXT NOT NULL,
+    updated_at    TEXT NOT NULL,
+    started_at    TEXT,
+    finished_at   TEXT,
+    duration_sec  REAL,
+    hata_mesaji   TEXT,
+    owner_host    TEXT,
+    owner_pid     INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_genel_durum ON jobs (genel_durum);
+
+CREATE TABLE IF NOT EXISTS builder_runs (
+    job_name      TEXT NOT NULL REFERENCES jobs (job_name) ON DELETE CASCADE,
+    motor         TEXT NOT NULL,
+    motor_durum   TEXT NOT NULL,
+    started_at    TEXT,
+    finished_at   TEXT,
+    duration_sec  REAL,
+    hata_mesaji   TEXT,
+    PRIMARY KEY (job_name, motor)
+);
+"""
+
+# Bu durumlar işin bittiğini gösterir (finished_at / duration_sec doldurulur)
+FINAL_STATES = ("TAMAMLANDI", "HATA")
+# Bu durumlar işin henüz tamamlanmadığını gösterir (pending_jobs indeksle bunları arar)
+PENDING_STATES = ("İŞLENİYOR", "HATA")
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def _pid_alive(pid: int) -> bool:
+    """Bu makinede verilen PID'e sahip bir sürecin hâlâ çalışıp çalışmadığını kontrol eder."""
+    if not pid or pid <= 0:
+        return False
+    if os.name == "nt":
+        # Windows'ta os.kill(pid, 0) süreci sonlandırır; bu yüzden OpenProcess ile sorgula
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return kernel32.GetLastError() == 5  # ERROR_ACCESS_DENIED: süreç var ama erişim yok
+        try:
+            exit_code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Süreç var, başka kullanıcıya ait
+    return True
+
+
+class JobStore:
+    """
+    Tüm işlerin ve motorların durumunu tutan gömülü SQLite veritabanı (WAL modu).
+    (Madde 3: Durum Yönetimi - status.json dosyalarının yerini alır)
+
+    Aynı bağlantı iş parçacıkları arasında bir kilit ile paylaşılır; WAL modu sayesinde
+    başka süreçler (örn: Streamlit arayüzü) yazma sürerken okuma yapabilir.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.owner_host = socket.gethostname()
+        self.owner_pid = os.getpid()
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+            # Sahiplik kolonları eklenmeden önce oluşturulmuş veritabanlarını güncelle
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in (("owner_host", "TEXT"), ("owner_pid", "INTEGER")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- Yazma İşlemleri ---
+    def start_job(self, job_name: str, stale_after_sec: float = None) -> bool:
+        """
+        İşi atomik olarak 'İŞLENİYOR' durumuna alır (claim) ve bu süreci (host + PID) sahibi
+        olarak kaydeder; önceki çalıştırmanın hata ve motor kayıtlarını temizler.
+
+        'İŞLENİYOR' bir iş yalnızca şu durumlarda yeniden alınır:
+          - Sahibi bu makinededir ve süreci artık çalışmıyordur (Ctrl+C, kill, OOM).
+          - 'stale_after_sec' verilmişse ve iş bu süreden uzun süredir 'heartbeat' almamışsa
+            (başka makinedeki çökmüş işçi).
+
+        Returns:
+            bool: İş bu çağrı ile alındıysa True; 'TAMAMLANDI' ise veya canlı bir işçide ise False.
+        """
+        now = _now()
+        with self._lock:
+            try:
+                # Yazma kilidini baştan al: okuma ve güncelleme arasında başka işçi araya giremez
+                self._conn.execute("BEGIN IMMEDIATE")
+                row = self._conn.execute(
+                    "SELECT genel_durum, updated_at, owner_host, owner_pid FROM jobs WHERE job_name = ?",
+                    (job_name,)
+                ).fetchone()
+
+                if row is not None and not self._is_claimable(row, stale_after_sec):
+                    self._conn.rollback()
+                    return False
+
+                self._conn.execute(
+                    """
+                    INSERT INTO jobs (job_name, genel_durum, created_at, updated_at, started_at, owner_host, owner_pid)
+                    VALUES (?, 'İŞLENİYOR', ?, ?, ?, ?, ?)
+                    ON CONFLICT (job_name) DO UPDATE SET
+                        genel_durum = 'İŞLENİYOR', updated_at = excluded.updated_at,
+                        started_at = excluded.started_at, finished_at = NULL,
+                        duration_sec = NULL, hata_mesaji = NULL,
+                        owner_host = excluded.owner_host, owner_pid = excluded.owner_pid
+                    """,
+                    (job_name, now, now, now, self.owner_host, self.owner_pid)
+                )
+                self._conn.execute("DELETE FROM builder_runs WHERE job_name = ?", (job_name,))
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return True
+
+    def _is_claimable(self, row: sqlite3.Row, stale_after_sec: float = None) -> bool:
+        """Mevcut bir iş satırının bu süreç tarafından alınıp alınamayacağına karar verir."""
+        if row["genel_durum"] == "TAMAMLANDI":
+            return False
+        if row["genel_durum"] != "İŞLENİYOR":
+            return True  # 'HATA' vb.: yeniden dene
+
+        # Sahibi bu makinede ve süreci ölmüşse hemen geri al
+        if row["owner_host"] == self.owner_host and not _pid_alive(row["owner_pid"]):
+            print(f"  [İş Deposu] Önceki sahip (PID {row['owner_pid']}) çalışmıyor. İş yeniden alınıyor.")
+            return True
+
+        # Sahip bilinmiyorsa veya başka makinedeyse: heartbeat zaman aşımı
+        if stale_after_sec is not None:
+            stale_before = datetime.fromtimestamp(time.time() - stale_after_sec).isoformat()
+            if row["updated_at"] < stale_before:
+                print(f"  [İş Deposu] İş {stale_after_sec} sn'dir güncellenmedi. Yeniden alınıyor.")
+                return True
+        return False
+
+    def heartbeat(self, job_name: str):
+        """Uzun süren işlerde 'updated_at' değerini yeniler (iş bu süreçteyse), böylece iş bayat sayılmaz."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                UPDATE jobs SET updated_at = ?
+                WHERE job_name = ? AND genel_durum = 'İŞLENİYOR' AND owner_host = ? AND owner_pid = ?
+                """,
+                (_now(), job_name, self.owner_host, self.owner_pid)
+            )
+
+    def reset_job(self, job_name: str) -> bool:
+        """
+        İşin kaydını (ve motor kayıtlarını) siler; sonraki taramada iş baştan işlenir.
+        Canlı bir işçide 'İŞLENİYOR' olan işler silinmez.
+
+        Returns:
+            bool: Kayıt silindiyse True.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT genel_durum, owner_host, owner_pid FROM jobs WHERE job_name = ?", (job_name,)
+            ).fetchone()
+            if row is None:
+                return False
+            if (row["genel_durum"] == "İŞLENİYOR"
+                    and not (row["owner_host"] == self.owner_host and not _pid_alive(row["owner_pid"]))):
+                print(f"Uyarı: '{job_name}' şu anda işleniyor. Sıfırlanmadı.")
+                return False
+            self._conn.execute("DELETE FROM builder_runs WHERE job_name = ?", (job_name,))
+            self._conn.execute("DELETE FROM jobs WHERE job_name = ?", (job_name,))
+        return True
+
+    def update_job(self, job_name: str, genel_durum: str, hata_mesaji: str = None):
+        """İşin genel durumunu günceller (iş yoksa oluşturur)."""
+        now = _now()
+        is_final = genel_durum in FINAL_STATES
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO jobs (job_name, genel_durum, created_at, updated_at, started_at, hata_mesaji)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (job_name) DO UPDATE SET
+                    genel_durum = excluded.genel_durum,
+                    updated_at = excluded.updated_at,
+                    hata_mesaji = COALESCE(excluded.hata_mesaji, jobs.hata_mesaji)
+                """,
+                (job_name, genel_durum, now, now, now, hata_mesaji)
+            )
+            if is_final:
+                self._conn.execute(
+                    """
+                    UPDATE jobs SET finished_at = ?,
+                        duration_sec = (julianday(?) - julianday(started_at)) * 86400.0
+                    WHERE job_name = ?
+                    """,
+                    (now, now, job_name)
+                )
+
+    def update_builder(self, job_name: str, motor: str, motor_durum: str,
+                       hata_mesaji: str = None, duration_sec: float = None):
+        """Bir işteki motorun (builder) durumunu, süresini ve hatasını kaydeder."""
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO builder_runs (job_name, motor, motor_durum, started_at, finished_at, duration_sec, hata_mesaji)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (job_name, motor) DO UPDATE SET
+                    motor_durum = excluded.motor_durum,
+                    finished_at = excluded.finished_at,
+                    duration_sec = COALESCE(excluded.duration_sec, builder_runs.duration_sec),
+                    hata_mesaji = COALESCE(excluded.hata_mesaji, builder_runs.hata_mesaji)
+                """,
+                (job_name, motor, motor_durum, now, now if duration_sec is not None else None,
+                 duration_sec, hata_mesaji)
+            )
+            self._conn.execute("UPDATE jobs SET updated_at = ? WHERE job_name = ?", (now, job_name))
+
+    # --- Okuma İşlemleri ---
+    def job_statuses(self) -> Dict[str, str]:
+        """Tüm işlerin {job_name: genel_durum} eşlemesini tek sorguda döndürür."""
+        with self._lock:
+            rows = self._conn.execute("SELECT job_name, genel_durum FROM jobs").fetchall()
+        return {row["job_name"]: row["genel_durum"] for row in rows}
+
+    def jobs_with_status(self, genel_durum: str) -> List[str]:
+        """Belirtilen durumdaki işlerin adlarını döndürür (indeksli sorgu)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_name FROM jobs WHERE genel_durum = ? ORDER BY job_name", (genel_durum,)
+            ).fetchall()
+        return [row["job_name"] for row in rows]
+
+    def pending_jobs(self) -> List[str]:
+        """Henüz 'TAMAMLANDI' olmayan (işleniyor veya hatalı) tüm işleri döndürür (indeksli sorgu)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_name FROM jobs WHERE genel_durum IN (?, ?) ORDER BY job_name", PENDING_STATES
+            ).fetchall()
+        return [row["job_name"] for row in rows]
+
+    def get_status(self, job_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Bir işin durumunu eski status.json biçiminde döndürür (iş yoksa None).
+        Ek olarak zamanlama bilgileri de içerir.
+        """
+        with self._lock:
+            job = self._conn.execute("SELECT * FROM jobs WHERE job_name = ?", (job_name,)).fetchone()
+            if job is None:
+                return None
+            builders = self._conn.execute(
+                "SELECT * FROM builder_runs WHERE job_name = ? ORDER BY started_at", (job_name,)
+            ).fetchall()
+
+        status_data = {
+            "genel_durum": job["genel_durum"],
+            "son_guncelleme": job["updated_at"],
+            "baslangic": job["started_at"],
+            "bitis": job["finished_at"],
+            "sure_sn": job["duration_sec"],
+        }
+        if builders:
+            status_data["calisan_motorlar"] = {b["motor"]: b["motor_durum"] for b in builders}
+            status_data["motor_sureleri_sn"] = {b["motor"]: b["duration_sec"] for b in builders}
+            motor_errors = {b["motor"]: b["hata_mesaji"] for b in builders if b["hata_mesaji"]}
+            if motor_errors:
+                status_data["motor_hatalari"] = motor_errors
+        if job["hata_mesaji"]:
+            status_data["hata_mesaji"] = job["hata_mesaji"]
+        return status_data
+
+    # --- status.json Uyumluluğu ---
+    def export_status_json(self, job_name: str, status_file: str):
+        """İşin durumunu eski araçlarla uyumluluk için status.json dosyasına yazar."""
+        status_data = self.get_status(job_name)
+        if status_data is None:
+            return
+        try:
+            tmp_file = status_file + ".tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(status_data, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_file, status_file)  # Yarım yazılmış dosya okunmasın
+        except Exception as e:
+            print(f"Uyarı: status.json dışa aktarılamadı! {status_file}. Hata: {e}")
+
+    def import_status_json(self, job_name: str, status_file: str) -> bool:
+        """Önceki sürümlerin yazdığı status.json dosyasını veritabanına aktarır."""
+        try:
+            with open(status_file, 'r', encoding='utf-8') as f:
+                status_data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False  # Bozuk veya okunamayan dosya: iş yeniden işlenir
+
+        genel_durum = status_data.get("genel_durum")
+        if not genel_durum:
+            return False
+
+        updated_at = status_data.get("son_guncelleme") or _now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR IGNORE INTO jobs (job_name, genel_durum, created_at, updated_at, hata_mesaji)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (job_name, genel_durum, updated_at, updated_at, status_data.get("hata_mesaji"))
+            )
+            for motor, motor_durum in status_data.get("calisan_motorlar", {}).items():
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO builder_runs (job_name, motor, motor_durum) VALUES (?, ?, ?)",
+                    (job_name, motor, motor_durum)
+                )
+        return True
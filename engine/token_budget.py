@@ -0,0 +1,162 @@
+# engine/token_budget.py
+import math
+from typing import List, Dict, Any
+
+
+# --- Yardımcı Fonksiyonlar ---
+def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    """
+    Bir metnin yaklaşık token sayısını tahmin eder.
+    (Gerçek tokenizer çağrısı yapmaz; karakter/token oranı ile kaba bir tahmin yürütür.)
+    """
+    if not text:
+        return 0
+    return int(math.ceil(len(text) / chars_per_token))
+
+
+def _split_text(text: str, max_tokens: int, chars_per_token: float) -> List[str]:
+    """Metni, her parça 'max_tokens' sınırını aşmayacak şekilde kelime sınırlarından böler."""
+    max_chars = max(1, int(max_tokens * chars_per_token))
+    chunks = []
+    current_words = []
+    current_len = 0
+
+    for word in text.split():
+        # Tek başına sınırı aşan (çok uzun) kelimeleri zorla parçala
+        while len(word) > max_chars:
+            if current_words:
+                chunks.append(" ".join(current_words))
+                current_words, current_len = [], 0
+            chunks.append(word[:max_chars])
+            word = word[max_chars:]
+
+        extra = len(word) + (1 if current_words else 0)
+        if current_len + extra > max_chars:
+            chunks.append(" ".join(current_words))
+            current_words, current_len = [word], len(word)
+        else:
+            current_words.append(word)
+            current_len += extra
+
+    if current_words:
+        chunks.append(" ".join(current_words))
+
+    return chunks
+
+
+# --- Ana Fonksiyon 1: Bütçeye Göre Gruplama ---
+def apply_token_budget(
+        grouped_steps: List[Dict[str, Any]],
+        max_tokens_per_group: int,
+        max_tokens_per_job: int,
+        prompt_overhead_tokens: int = 0,
+        image_tokens: int = 0,
+        chars_per_token: float = 4.0
+) -> List[Dict[str, Any]]:
+    """
+    'merge_similar_segments' çıktısını token bütçesine göre yeniden düzenler.
+
+    - Sınırı aşan grupların 'combined_transcript' metni parçalara bölünür
+      (her parça aynı temsilci PNG'yi ve aynı 'group_index' değerini kullanır;
+      parçaların AI metinleri 'merge_split_parts' ile tek adımda birleştirilir).
+    - İşin toplam token tahmini 'max_tokens_per_job' sınırını aşarsa hiçbir AI çağrısı
+      yapılmadan ValueError fırlatılır (içerik sessizce kırpılmaz, iş 'HATA' olur).
+
+    Returns:
+        List[Dict[str, Any]]: Grup listesi; her gruba 'estimated_tokens', 'group_index'
+                              ve 'part_index' eklenir.
+    """
+    print("  [Token Bütçesi] Gruplar token bütçesine göre düzenleniyor...")
+    if not grouped_steps:
+        return []
+
+    # Transkript için kalan pay: istem şablonu ve görsel maliyeti düşülür
+    transcript_budget = max_tokens_per_group - prompt_overhead_tokens - image_tokens
+    if transcript_budget <= 0:
+        raise ValueError(
+            f"Token Bütçesi: Grup sınırı ({max_tokens_per_group}) istem şablonu ve görsel "
+            f"maliyetini ({prompt_overhead_tokens + image_tokens}) karşılamıyor."
+        )
+
+    budgeted_steps = []
+    split_count = 0
+
+    for group_index, group in enumerate(grouped_steps):
+        transcript = group['combined_transcript']
+        if estimate_tokens(transcript, chars_per_token) > transcript_budget:
+            parts = _split_text(transcript, transcript_budget, chars_per_token)
+            split_count += 1
+        else:
+            parts = [transcript]
+
+        for part_index, part in enumerate(parts):
+            new_group = dict(group)
+            new_group['combined_transcript'] = part
+            new_group['group_index'] = group_index
+            new_group['part_index'] = part_index
+            new_group['estimated_tokens'] = (
+                    prompt_overhead_tokens + image_tokens + estimate_tokens(part, chars_per_token)
+            )
+            budgeted_steps.append(new_group)
+
+    # İş bazlı toplam sınır: aşılırsa kalan grupları atmak yerine işi durdur
+    job_total = sum(g['estimated_tokens'] for g in budgeted_steps)
+    if job_total > max_tokens_per_job:
+        raise ValueError(
+            f"Token Bütçesi: İşin tahmini token harcaması ({job_total}) iş sınırını "
+            f"({max_tokens_per_job}) aşıyor ({len(budgeted_steps)} grup). "
+            f"MAX_TOKENS_PER_JOB değerini artırın veya girdiyi bölün."
+        )
+
+    print(
+        f"  [Token Bütçesi] Tamamlandı. {split_count} grup bölündü, "
+        f"{len(grouped_steps)} grup -> {len(budgeted_steps)} grup."
+    )
+    return budgeted_steps
+
+
+# --- Ana Fonksiyon 2: Bölünmüş Parçaları Birleştirme ---
+def merge_split_parts(instruction_steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Aynı 'group_index' değerine sahip ardışık adımların 'ai_generated_text' metinlerini
+    tek bir adımda birleştirir (bölünmüş grup PDF'te aynı görselle tekrarlanmasın diye).
+
+    Returns:
+        List[Dict[str, Any]]: {'representative_png', 'ai_generated_text'} listesi.
+    """
+    merged_steps = []
+    last_index = None
+
+    for step in instruction_steps:
+        group_index = step.get('group_index')
+        if merged_steps and group_index is not None and group_index == last_index:
+            merged_steps[-1]['ai_generated_text'] += "\n\n" + step['ai_generated_text']
+        else:
+            merged_steps.append({
+                "representative_png": step['representative_png'],
+                "ai_generated_text": step['ai_generated_text']
+            })
+        last_index = group_index
+
+    return merged_steps
+
+
+# --- Ana Fonksiyon 3: Harcama Raporu ---
+def report_token_spend(job_name: str, grouped_steps: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    AI çağrıları yapılmadan önce iş için tahmini token harcamasını raporlar.
+
+    Returns:
+        Dict[str, Any]: {'group_count', 'total_tokens', 'max_group_tokens'} özeti.
+    """
+    tokens = [g.get('estimated_tokens', 0) for g in grouped_steps]
+    report = {
+        "group_count": len(tokens),
+        "total_tokens": sum(tokens),
+        "max_group_tokens": max(tokens) if tokens else 0,
+    }
+    print(
+        f"[{job_name}] Tahmini token harcaması: {report['total_tokens']} token "
+        f"({report['group_count']} AI çağrısı, en büyük grup {report['max_group_tokens']} token)."
+    )
+    return report
@@ -0,0 +1,114 @@
+# load_test.py
+"""
+AI katmanı için çevrimdışı yük testi.
+
+Örnekler:
+    # Yerel Gemini stub sunucusunu süreç içinde başlatıp Gemini istemcisini ona yönlendir
+    python load_test.py --provider GEMINI --stub --latency lognormal --mean 1.5 --rate-limit 0.05 --concurrency 8
+
+    # Önceden kaydedilmiş kaseti (AI_PROVIDER_TYPE=RECORD ile) oynat
+    AI_REPLAY_SPEED=1 python load_test.py --provider REPLAY --concurrency 4
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+import config
+from main import AVAILABLE_AI_PROVIDERS
+from engine.gemini_stub_server import StubSettings, create_server
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_load_test(provider, prompts: list, image: Image.Image = None, concurrency: int = 4) -> dict:
+    """İstemleri verilen eşzamanlılıkla sağlayıcıya gönderir ve gecikme/hata özetini döndürür."""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def _call(prompt):
+        nonlocal errors
+        start = time.perf_counter()
+        text = provider.generate_content(prompt, image)
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            # Sağlayıcılar hataları '[... Hatası: ...]' metni olarak döndürür
+            if text.startswith("[") and "Hatası" in text.split("\n", 1)[0]:
+                errors += 1
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(_call, prompts))
+    wall = time.perf_counter() - wall_start
+
+    return {
+        "requests": len(prompts),
+        "errors": errors,
+        "wall_sec": round(wall, 3),
+        "throughput_rps": round(len(prompts) / wall, 2) if wall else 0.0,
+        "p50_sec": round(_percentile(latencies, 50), 3),
+        "p95_sec": round(_percentile(latencies, 95), 3),
+        "p99_sec": round(_percentile(latencies, 99), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI katmanı yük testi (ağ erişimi olmadan)")
+    parser.add_argument("--provider", default="GEMINI", choices=sorted(AVAILABLE_AI_PROVIDERS))
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--image", default=None, help="Her isteğe eklenecek PNG yolu (opsiyonel)")
+    parser.add_argument("--prompt-chars", type=int, default=2000, help="Sentetik istem uzunluğu")
+    parser.add_argument("--stub", action="store_true", help="Yerel Gemini stub sunucusunu süreç içinde başlat")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="lognormal", choices=["fixed", "uniform", "normal", "lognormal"])
+    parser.add_argument("--mean", type=float, default=1.0)
+    parser.add_argument("--spread", type=float, default=0.5)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--failure", type=float, default=0.0)
+    parser.add_argument("--max-concurrent", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = None
+    settings = None
+    if args.stub:
+        settings = StubSettings(args.latency, args.mean, args.spread, args.rate_limit,
+                                args.failure, args.max_concurrent, seed=args.seed)
+        server = create_server("127.0.0.1", args.port, settings)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        config.GEMINI_API_ENDPOINT = f"http://127.0.0.1:{args.port}"
+        print(f"[Yük Testi] Stub sunucusu başlatıldı: {config.GEMINI_API_ENDPOINT}")
+
+    try:
+        provider = AVAILABLE_AI_PROVIDERS[args.provider](config)
+        image = None
+        if args.image:
+            # PIL tembel yükleme yapar ve bu iş parçacığı güvenli değildir; havuza vermeden önce yükle
+            image = Image.open(args.image)
+            image.load()
+        # Her istem farklı olsun (kayıt/oynatma anahtarları çakışmasın diye sıra numarası eklenir)
+        filler = "x" * max(0, args.prompt_chars)
+        prompts = [f"[{i}] {filler}" for i in range(args.requests)]
+
+        summary = run_load_test(provider, prompts, image, args.concurrency)
+        print(f"[Yük Testi] Sonuç: {summary}")
+        if settings:
+            print(f"[Yük Testi] Stub istatistikleri: {settings.stats}")
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
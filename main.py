@@ -1,14 +1,16 @@
 # main.py
 import config
 import os
-import json
 import time
-from datetime import datetime
 
 # AI Sağlayıcıları
 from engine.ai_base import BaseAIProvider
 from engine.ai_gemini import GeminiProvider
 from engine.ai_mock import MockProvider
+from engine.ai_replay import RecordingProvider, ReplayProvider
+
+# Durum Yönetimi
+from engine.job_store import JobStore
 
 # Motor (Builder) Sınıfları
 from builder.pdf_builder import PDFBuilder
@@ -23,6 +25,8 @@ AVAILABLE_BUILDERS = {
 AVAILABLE_AI_PROVIDERS = {
     "GEMINI": GeminiProvider,
     "MOCK": MockProvider,
+    "RECORD": RecordingProvider,  # Gemini çağrılarını kasete kaydeder
+    "REPLAY": ReplayProvider,     # Kaseti ağ erişimi olmadan oynatır
 }
 
 
@@ -34,45 +38,96 @@ def setup_ai_provider() -> BaseAIProvider:
         print(f"Hata: '{provider_name}' geçerli bir AI sağlayıcı değil. 'MOCK' kullanılacak.")
         provider_name = "MOCK"
 
-    if provider_name == "GEMINI" and not config.API_ANAHTARI:
-        print("Uyarı: 'GEMINI' seçildi ancak API anahtarı bulunamadı. 'MOCK' kullanılacak.")
+    if provider_name in ("GEMINI", "RECORD") and not config.API_ANAHTARI and not config.GEMINI_API_ENDPOINT:
+        print(f"Uyarı: '{provider_name}' seçildi ancak API anahtarı bulunamadı. 'MOCK' kullanılacak.")
         provider_name = "MOCK"
 
     ProviderClass = AVAILABLE_AI_PROVIDERS[provider_name]
     return ProviderClass(config)
 
 
-def update_status(status_file: str, genel_durum: str, motor: str = None, motor_durum: str = None, hata_mesaji: str = None):
+def update_status(store: JobStore, job_name: str, genel_durum: str, motor: str = None, motor_durum: str = None,
+                  hata_mesaji: str = None, sure_sn: float = None):
     """
-    status.json dosyasını okur, günceller ve yazar. (Madde 3: Durum Yönetimi)
+    İş durumunu veritabanına yazar; istenirse status.json olarak da dışa aktarır. (Madde 3: Durum Yönetimi)
     """
-    status_data = {}
-    if os.path.exists(status_file):
-        try:
-            with open(status_file, 'r', encoding='utf-8') as f:
-                status_data = json.load(f)
-        except json.JSONDecodeError:
-            pass # Dosya bozuksa üzerine yaz
+    try:
+        if motor and motor_durum:
+            store.update_builder(job_name, motor, motor_durum, hata_mesaji=hata_mesaji, duration_sec=sure_sn)
+        store.update_job(job_name, genel_durum, hata_mesaji=None if motor else hata_mesaji)
+    except Exception as e:
+        print(f"KRİTİK HATA: İş durumu veritabanına yazılamadı! {store.db_path}. Hata: {e}")
+        return
 
-    status_data["genel_durum"] = genel_durum # genel_durum'u kullan
-    status_data["son_guncelleme"] = datetime.now().isoformat()
+    if config.EXPORT_STATUS_JSON:
+        job_output_dir = os.path.join(config.OUTPUT_DIR, job_name)
+        if os.path.isdir(job_output_dir):
+            store.export_status_json(job_name, os.path.join(job_output_dir, "status.json"))
 
-    if motor and motor_durum: # motor_durum'u kontrol et
-        if "calisan_motorlar" not in status_data:
-            status_data["calisan_motorlar"] = {}
-        status_data["calisan_motorlar"][motor] = motor_durum # motor_durum'u ata
 
-    if hata_mesaji:
-        status_data["hata_mesaji"] = hata_mesaji
+def process_job(store: JobStore, ai_provider: BaseAIProvider, job_name: str, job_input_dir: str, job_output_dir: str):
+    """Alınmış (claim edilmiş) tek bir işi baştan sona çalıştırır ve durumunu kaydeder."""
+    print(f"\n--- Yeni İş Başlatıldı: '{job_name}' ---")
+    os.makedirs(job_output_dir, exist_ok=True)
+    update_status(store, job_name, genel_durum="İŞLENİYOR")
 
+    # 4. Hammaddeleri Hazırla (Her iş için özel)
     try:
-        with open(status_file, 'w', encoding='utf-8') as f:
-            json.dump(status_data, f, indent=4, ensure_ascii=False)
+        # (Streamlit için bu bölümü daha esnek hale getireceğiz,
+        # şimdilik video/transkript varsayıyoruz)
+        video_path = os.path.join(job_input_dir, "video.mp4")
+        srt_path = os.path.join(job_input_dir, "transkript.srt")
+
+        if not os.path.exists(video_path) or not os.path.exists(srt_path):
+            raise FileNotFoundError(f"Girdi dosyaları bulunamadı: video.mp4 veya transkript.srt eksik.")
+
+        raw_materials = {
+            "job_name": job_name,
+            "input_dir": job_input_dir,
+            "output_dir": job_output_dir,
+            "video_path": video_path,
+            "srt_path": srt_path,
+            "heartbeat": lambda: store.heartbeat(job_name),  # Uzun işlerin bayat sayılmaması için
+        }
+    except Exception as e:
+        print(f"Hata: '{job_name}' için hammaddeler hazırlanamadı. Hata: {e}")
+        update_status(store, job_name, genel_durum="HATA", hata_mesaji=str(e))
+        return  # Sonraki işe geç
+
+    # 5. Üretim Hattını (Builder'ları) Çalıştır
+    try:
+        for builder_name in config.BUILDERS_TO_RUN:
+            if builder_name in AVAILABLE_BUILDERS:
+                print(f"[{job_name}] -> '{builder_name}' motoru çalıştırılıyor...")
+                BuilderClass = AVAILABLE_BUILDERS[builder_name]
+                update_status(store, job_name, genel_durum="İŞLENİYOR", motor=builder_name, motor_durum="ÇALIŞIYOR")
+                builder_start = time.perf_counter()
+
+                # 7. Hata Yönetimi (Madde 7)
+                try:
+                    builder_instance = BuilderClass(config, ai_provider, raw_materials)
+                    builder_instance.run()  # Builder'ın kendi içindeki build() metodunu çağırır
+                except BaseException as e:
+                    update_status(store, job_name, genel_durum="İŞLENİYOR", motor=builder_name, motor_durum="HATA",
+                                  hata_mesaji=str(e) or type(e).__name__,
+                                  sure_sn=time.perf_counter() - builder_start)
+                    raise
+
+                update_status(store, job_name, genel_durum="İŞLENİYOR", motor=builder_name, motor_durum="BAŞARILI",
+                              sure_sn=time.perf_counter() - builder_start)
+            else:
+                print(f"Uyarı: '{builder_name}' motoru bulunamadı.")
+
+        update_status(store, job_name, genel_durum="TAMAMLANDI")
+        print(f"--- İş Başarıyla Tamamlandı: '{job_name}' ---")
+
     except Exception as e:
-        print(f"KRİTİK HATA: Durum dosyası yazılamadı! {status_file}. Hata: {e}")
+        # 7. Hata Yönetimi (Genel)
+        print(f"!! KRİTİK HATA: '{job_name}' işlenirken çöktü. Hata: {e}")
+        update_status(store, job_name, genel_durum="HATA", hata_mesaji=str(e))
 
 
-def main_factory():
+def main_factory(reset_jobs: list = None):
     print("--- İçerik Fabrikası Başlatıldı ---")
 
     # 1. AI Sağlayıcıyı bir kez kur
@@ -82,73 +137,60 @@ def main_factory():
         print(f"Kritik Hata: AI Sağlayıcı başlatılamadı. {e}")
         return
 
-    # 2. İşleri (Jobs) Tara (Madde 2: İş Bazlı Hiyerarşi)
-    for job_name in os.listdir(config.INPUT_DIR):
-        job_input_dir = os.path.join(config.INPUT_DIR, job_name)
-        job_output_dir = os.path.join(config.OUTPUT_DIR, job_name)
-
-        if not os.path.isdir(job_input_dir):
-            continue  # Klasör değilse atla
+    store = JobStore(config.JOB_DB_PATH)
+    try:
+        # İstenen işleri sıfırla (yeniden işlenmeleri için)
+        for job_name in reset_jobs or []:
+            if store.reset_job(job_name):
+                print(f"'{job_name}' sıfırlandı, yeniden işlenecek.")
+
+        # Tüm işlerin durumunu tek sorguda al (her iş için status.json açmak yerine)
+        job_statuses = store.job_statuses()
+
+        # 2. İşleri (Jobs) Tara (Madde 2: İş Bazlı Hiyerarşi)
+        for job_name in os.listdir(config.INPUT_DIR):
+            job_input_dir = os.path.join(config.INPUT_DIR, job_name)
+            job_output_dir = os.path.join(config.OUTPUT_DIR, job_name)
+
+            if not os.path.isdir(job_input_dir):
+                continue  # Klasör değilse atla
+
+            # 3. Durum (State) Kontrolü (Madde 3)
+            if job_name not in job_statuses:
+                # Eski sürümden kalan status.json varsa bir kez veritabanına aktar
+                legacy_status_file = os.path.join(job_output_dir, "status.json")
+                if os.path.exists(legacy_status_file) and store.import_status_json(job_name, legacy_status_file):
+                    job_statuses[job_name] = store.get_status(job_name)["genel_durum"]
+
+            if job_statuses.get(job_name) == "TAMAMLANDI":
+                if os.path.isdir(job_output_dir):
+                    print(f"'{job_name}' zaten işlenmiş. Atlanıyor.")
+                    continue
+                # Çıktı klasörü silinmişse (eski davranış) işi yeniden işle
+                print(f"'{job_name}' tamamlanmış görünüyor ancak çıktı klasörü yok. Yeniden işlenecek.")
+                store.reset_job(job_name)
+
+            # İşi atomik olarak al: canlı bir işçide ise veya bu arada tamamlandıysa atla
+            if not store.start_job(job_name, stale_after_sec=config.JOB_STALE_AFTER_SEC):
+                print(f"'{job_name}' başka bir işçi tarafından işleniyor veya tamamlandı. Atlanıyor.")
+                continue
 
-        # 3. Durum (State) Kontrolü (Madde 3)
-        status_file = os.path.join(job_output_dir, "status.json")
-        if os.path.exists(status_file):
             try:
-                with open(status_file, 'r', encoding='utf-8') as f:
-                    if json.load(f).get("genel_durum") == "TAMAMLANDI":
-                        print(f"'{job_name}' zaten işlenmiş. Atlanıyor.")
-                        continue
-            except:
-                pass  # Bozuk status dosyası, yeniden işle
-
-        print(f"\n--- Yeni İş Başlatıldı: '{job_name}' ---")
-        os.makedirs(job_output_dir, exist_ok=True)
-        update_status(status_file, genel_durum="İŞLENİYOR")
-
-        # 4. Hammaddeleri Hazırla (Her iş için özel)
-        try:
-            # (Streamlit için bu bölümü daha esnek hale getireceğiz,
-            # şimdilik video/transkript varsayıyoruz)
-            video_path = os.path.join(job_input_dir, "video.mp4")
-            srt_path = os.path.join(job_input_dir, "transkript.srt")
-
-            if not os.path.exists(video_path) or not os.path.exists(srt_path):
-                raise FileNotFoundError(f"Girdi dosyaları bulunamadı: video.mp4 veya transkript.srt eksik.")
-
-            raw_materials = {
-                "job_name": job_name,
-                "input_dir": job_input_dir,
-                "output_dir": job_output_dir,
-                "video_path": video_path,
-                "srt_path": srt_path,
-            }
-        except Exception as e:
-            print(f"Hata: '{job_name}' için hammaddeler hazırlanamadı. Hata: {e}")
-            update_status(status_file, genel_durum="HATA", hata_mesaji=str(e))
-            continue  # Sonraki işe geç
-
-        # 5. Üretim Hattını (Builder'ları) Çalıştır
-        try:
-            for builder_name in config.BUILDERS_TO_RUN:
-                if builder_name in AVAILABLE_BUILDERS:
-                    print(f"[{job_name}] -> '{builder_name}' motoru çalıştırılıyor...")
-                    BuilderClass = AVAILABLE_BUILDERS[builder_name]
-                    builder_instance = BuilderClass(config, ai_provider, raw_materials)
-
-                    # 7. Hata Yönetimi (Madde 7)
-                    builder_instance.run()  # Builder'ın kendi içindeki build() metodunu çağırır
-                    update_status(status_file, genel_durum="İŞLENİYOR", motor=builder_name, motor_durum="BAŞARILI")
-                else:
-                    print(f"Uyarı: '{builder_name}' motoru bulunamadı.")
-
-            update_status(status_file, genel_durum="TAMAMLANDI")
-            print(f"--- İş Başarıyla Tamamlandı: '{job_name}' ---")
-
-        except Exception as e:
-            # 7. Hata Yönetimi (Genel)
-            print(f"!! KRİTİK HATA: '{job_name}' işlenirken çöktü. Hata: {e}")
-            update_status(status_file, genel_durum="HATA", hata_mesaji=str(e))
+                process_job(store, ai_provider, job_name, job_input_dir, job_output_dir)
+            except BaseException as e:
+                # Ctrl+C, SystemExit vb.: iş 'İŞLENİYOR' olarak kalmasın
+                print(f"!! '{job_name}' kesildi ({type(e).__name__}). 'HATA' olarak işaretleniyor.")
+                update_status(store, job_name, genel_durum="HATA", hata_mesaji=f"İşlem kesildi: {type(e).__name__}")
+                raise
+    finally:
+        store.close()
 
 
 if __name__ == "__main__":
-    main_factory()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="İçerik Fabrikası")
+    parser.add_argument("--reset", nargs="+", default=[], metavar="İŞ",
+                        help="Bu işlerin durum kaydını silip yeniden işle")
+    args = parser.parse_args()
+    main_factory(reset_jobs=args.reset)
\ No newline at end of file